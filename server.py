@@ -1,20 +1,29 @@
 import os
 import shutil
+import asyncio
+import time
+import functools
+import heapq
+import itertools
+import orjson
+from collections import OrderedDict
 from pathlib import Path
 from fastapi import FastAPI, Request, UploadFile, File, HTTPException, Form, Depends
-from fastapi.responses import HTMLResponse, FileResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, FileResponse, RedirectResponse, StreamingResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.middleware.sessions import SessionMiddleware
 import uvicorn
+import aiofiles
 from datetime import datetime
 import mimetypes
 from urllib.parse import quote, unquote
-import getpass
 import platform
 import socket
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
+
+_quote = functools.lru_cache(maxsize=8192)(quote)
 
 # Hardcoded credentials
 USERNAME = "khushi"
@@ -42,7 +51,11 @@ SERVER_DIR = Path(__file__).parent.resolve()
 
 templates = Jinja2Templates(directory=str(SERVER_DIR / "templates"))
 
-TRASH_DIR = Path.home() / ".liquid_commander_trash"
+DEVICE_NAME = socket.gethostname() or platform.node() or "Local Disk"
+HOME_PATH = Path.home().resolve()
+HOME_PATH_QUOTED = _quote(str(HOME_PATH))
+
+TRASH_DIR = HOME_PATH / ".liquid_commander_trash"
 TRASH_DIR.mkdir(parents=True, exist_ok=True)
 
 PROTECTED_PATHS = {
@@ -52,23 +65,34 @@ PROTECTED_PATHS = {
     SERVER_DIR / "templates",
     TRASH_DIR
 }
+PROTECTED_PATH_STRS = frozenset(str(p.resolve()) for p in PROTECTED_PATHS)
+TRASH_DIR_STR = str(TRASH_DIR.resolve())
+
+ARCHIVE_EXTS = frozenset({"zip", "rar", "7z", "tar", "gz"})
+CODE_EXTS = frozenset({"py", "js", "html", "css", "json", "md", "txt", "sh"})
+PDF_EXTS = frozenset({"pdf"})
+MIME_PREFIX_TYPE = (("image/", "image"), ("video/", "video"), ("audio/", "audio"))
+
+@functools.lru_cache(maxsize=512)
+def _mime_for_ext(ext: str) -> str:
+    return mimetypes.types_map.get("." + ext) or mimetypes.guess_type("x." + ext)[0] or "application/octet-stream"
 
 def ensure_trash_dir():
     TRASH_DIR.mkdir(parents=True, exist_ok=True)
 
 def is_protected_path(path: Path):
     try:
-        resolved = path.resolve()
+        resolved = os.path.realpath(path)
     except Exception:
         return False
-    return resolved in PROTECTED_PATHS
+    return resolved in PROTECTED_PATH_STRS
 
 def is_in_trash(path: Path):
     try:
-        resolved = path.resolve()
+        resolved = os.path.realpath(path)
     except Exception:
         return False
-    return resolved == TRASH_DIR or TRASH_DIR in resolved.parents
+    return resolved == TRASH_DIR_STR or resolved.startswith(TRASH_DIR_STR + os.sep)
 
 def move_to_trash(target: Path):
     ensure_trash_dir()
@@ -87,63 +111,325 @@ def move_to_trash(target: Path):
     shutil.move(str(resolved), str(dest))
     return True
 
-def get_file_info(current_dir: Path, search_query: str = "", show_hidden: bool = False):
-    folders = []
-    files = []
+def classify_file(name: str):
+    stem, dot, ext = name.rpartition('.')
+    ext = ext.lower() if dot and stem else ""
+    mime = _mime_for_ext(ext)
+    
+    file_type = next((t for p, t in MIME_PREFIX_TYPE if mime.startswith(p)), None)
+    if file_type is None:
+        if ext in PDF_EXTS: file_type = "pdf"
+        elif ext in ARCHIVE_EXTS: file_type = "archive"
+        elif ext in CODE_EXTS: file_type = "code"
+        else: file_type = "file"
+    return ext, mime, file_type
+
+def scan_entries(current_dir: Path, search_query: str = "", show_hidden: bool = False, file_type: str = "all"):
+    q = search_query.lower() if search_query else None
+    skip_names = {str(SERVER_DIR / 'venv'), str(SERVER_DIR / '__pycache__')}
     try:
-        items = sorted(list(current_dir.iterdir()), key=lambda x: x.name.lower())
-        for path in items:
-            if path == SERVER_DIR / 'venv' or path == SERVER_DIR / '__pycache__':
+        it = os.scandir(current_dir)
+    except Exception:
+        return
+
+    with it:
+        for entry in it:
+            if entry.path in skip_names:
                 continue
             
             # Filter hidden files if requested
-            if not show_hidden and path.name.startswith('.'):
+            if not show_hidden and entry.name.startswith('.'):
                 continue
             
-            if search_query and search_query.lower() not in path.name.lower():
+            if q and q not in entry.name.lower():
+                continue
+
+            # Dangling symlinks can't be stat'ed, so keep them out of totals and pages alike
+            if entry.is_symlink() and not os.path.exists(entry.path):
                 continue
 
-            try:
-                stats = path.stat()
-                mtime = datetime.fromtimestamp(stats.st_mtime).strftime('%b %d, %Y')
-                safe_path = quote(str(path.resolve()))
-                
-                info = {
-                    "name": path.name,
-                    "rel_path": str(path.resolve()),
-                    "safe_path": safe_path,
-                    "mtime": mtime,
-                    "is_dir": path.is_dir()
-                }
-
-                if path.is_dir():
-                    try:
-                        info["item_count"] = sum(1 for _ in path.iterdir() if not _.name.startswith('.'))
-                    except:
-                        info["item_count"] = 0
-                    folders.append(info)
-                else:
-                    mime_type, _ = mimetypes.guess_type(path)
-                    info["size_bytes"] = stats.st_size
-                    info["size"] = f"{stats.st_size / (1024*1024):.2f} MB"
-                    info["ext"] = path.suffix.lower().lstrip('.')
-                    info["mime"] = mime_type or "application/octet-stream"
-                    
-                    if info["mime"].startswith("image/"): info["type"] = "image"
-                    elif info["mime"].startswith("video/"): info["type"] = "video"
-                    elif info["mime"].startswith("audio/"): info["type"] = "audio"
-                    elif info["ext"] in ["pdf"]: info["type"] = "pdf"
-                    elif info["ext"] in ["zip", "rar", "7z", "tar", "gz"]: info["type"] = "archive"
-                    elif info["ext"] in ["py", "js", "html", "css", "json", "md", "txt", "sh"]: info["type"] = "code"
-                    else: info["type"] = "file"
-                    
-                    files.append(info)
-            except Exception:
+            # Type filters keep every folder; a file's type comes from its name alone
+            if file_type != "all" and not entry.is_dir() and classify_file(entry.name)[2] != file_type:
                 continue
+
+            yield entry
+
+def _entry_mtime(entry: os.DirEntry):
+    try:
+        return entry.stat().st_mtime
+    except OSError:
+        return 0
+
+def _entry_size(entry: os.DirEntry):
+    if entry.is_dir():
+        return 0
+    try:
+        return entry.stat().st_size
+    except OSError:
+        return 0
+
+# Newest/largest first for date and size; name breaks ties. stat() results stay cached on the DirEntry.
+ENTRY_SORT_KEYS = {
+    "name": lambda entry: entry.name.lower(),
+    "date": lambda entry: (-_entry_mtime(entry), entry.name.lower()),
+    "size": lambda entry: (-_entry_size(entry), entry.name.lower()),
+}
+
+# The same orderings over built rows, to re-interleave a page's folders and files
+ROW_SORT_KEYS = {
+    "name": lambda row: row["name"].lower(),
+    "date": lambda row: (-row["mtime_ts"], row["name"].lower()),
+    "size": lambda row: (-row.get("size_bytes", 0), row["name"].lower()),
+}
+
+def order_entries(entries, sort: str = "name", offset: int = 0, limit: int = 0):
+    stop = offset + limit if limit > 0 else None
+    if sort == "none":
+        # Directory order, like `ls -U`: rows go out as they are read
+        return itertools.islice(entries, offset, stop)
+    key = ENTRY_SORT_KEYS.get(sort, ENTRY_SORT_KEYS["name"])
+    if stop is not None:
+        ordered = heapq.nsmallest(stop, entries, key=key)
+    else:
+        ordered = sorted(entries, key=key)
+    return ordered[offset:]
+
+def entry_info(entry: os.DirEntry, include_counts: bool = False, metadata: str = "full", show_hidden: bool = False):
+    try:
+        if metadata == "minimal":
+            # Names and the readdir d_type only; no stat() call
+            is_dir = entry.is_dir()
+            return {"kind": "folder" if is_dir else "file", "name": entry.name, "is_dir": is_dir}
+
+        stats = entry.stat()
+        is_dir = entry.is_dir()
+        mtime = time.strftime('%b %d, %Y', time.localtime(stats.st_mtime))
+        # current_dir is already resolved, so only symlinks need realpath
+        resolved_str = os.path.realpath(entry.path) if entry.is_symlink() else entry.path
+        
+        info = {
+            "kind": "folder" if is_dir else "file",
+            "name": entry.name,
+            "rel_path": resolved_str,
+            "safe_path": _quote(resolved_str),
+            "mtime": mtime,
+            "mtime_ts": stats.st_mtime,
+            "is_dir": is_dir
+        }
+
+        if is_dir:
+            if include_counts:
+                try:
+                    # Count what opening the folder would show: dotfiles only when hidden files are shown
+                    info["item_count"] = sum(1 for n in os.listdir(entry.path) if show_hidden or not n.startswith('.'))
+                except:
+                    info["item_count"] = 0
+        else:
+            info["size_bytes"] = stats.st_size
+            info["size"] = f"{stats.st_size / (1024*1024):.2f} MB"
+            info["ext"], info["mime"], info["type"] = classify_file(entry.name)
     except Exception:
-        pass
-            
-    return {"folders": folders, "files": files}
+        return None
+    return info
+
+def iter_file_info(current_dir: Path, search_query: str = "", show_hidden: bool = False, include_counts: bool = False, sort: str = "name", offset: int = 0, limit: int = 0, metadata: str = "full", file_type: str = "all"):
+    entries = scan_entries(current_dir, search_query, show_hidden, file_type)
+    for entry in order_entries(entries, sort, offset, limit):
+        info = entry_info(entry, include_counts, metadata, show_hidden)
+        if info is not None:
+            yield info
+
+def list_entries(current_dir: Path, search_query: str = "", show_hidden: bool = False, sort: str = "name", file_type: str = "all"):
+    entries = scan_entries(current_dir, search_query, show_hidden, file_type)
+    if sort == "none":
+        return list(entries)
+    return sorted(entries, key=ENTRY_SORT_KEYS.get(sort, ENTRY_SORT_KEYS["name"]))
+
+def build_page(entries: list, offset: int = 0, limit: int = 0, include_counts: bool = False, metadata: str = "full", show_hidden: bool = False):
+    folders = []
+    files = []
+    stop = offset + limit if limit > 0 else None
+    for entry in entries[offset:stop]:
+        info = entry_info(entry, include_counts, metadata, show_hidden)
+        if info is None:
+            continue
+        if info["is_dir"]:
+            folders.append(info)
+        else:
+            files.append(info)
+    return {"total": len(entries), "folders": folders, "files": files}
+
+def get_file_info(current_dir: Path, search_query: str = "", show_hidden: bool = False, include_counts: bool = False, sort: str = "name", offset: int = 0, limit: int = 0, metadata: str = "full", file_type: str = "all"):
+    entries = list_entries(current_dir, search_query, show_hidden, sort, file_type)
+    return build_page(entries, offset, limit, include_counts, metadata, show_hidden)
+
+def generate_ndjson(current_dir: Path, search_query: str = "", show_hidden: bool = False, include_counts: bool = False, sort: str = "name", offset: int = 0, limit: int = 0, metadata: str = "full"):
+    for row in iter_file_info(current_dir, search_query, show_hidden, include_counts, sort, offset, limit, metadata):
+        yield orjson.dumps(row) + b"\n"
+
+def build_breadcrumbs(target_dir: Path):
+    parts = [{"name": "Root", "path": "/"}]
+    acc = ""
+    for seg in str(target_dir).split("/"):
+        if not seg:
+            continue
+        acc = acc + "/" + seg
+        parts.append({"name": seg, "path": acc})
+    return parts
+
+UPLOAD_CHUNK_SIZE = 1 << 20
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+class PagedFileResponse(FileResponse):
+    # Read whole pages per chunk and ask reverse proxies not to buffer the body
+    chunk_size = DOWNLOAD_CHUNK_SIZE
+
+    def __init__(self, *args, headers=None, **kwargs):
+        headers = {"X-Accel-Buffering": "no", **(headers or {})}
+        super().__init__(*args, headers=headers, **kwargs)
+
+LISTING_TTL = 2.0
+LISTING_CACHE_SIZE = 256
+_listing_cache: OrderedDict[tuple, tuple[float, int, list]] = OrderedDict()
+# dir -> [lock, number of requests using it]; dropped once nobody holds or waits on it
+_listing_locks: dict[str, list] = {}
+
+def copy_path(src: Path, dest: Path):
+    if src.is_dir():
+        shutil.copytree(src, dest, dirs_exist_ok=True)
+    else:
+        shutil.copy2(src, dest)
+
+def remove_path(target: Path):
+    if target.is_dir():
+        shutil.rmtree(target)
+    else:
+        target.unlink()
+
+def delete_or_trash(target: Path):
+    if not target.exists() or is_protected_path(target):
+        return
+    if is_in_trash(target):
+        remove_path(target)
+    else:
+        move_to_trash(target)
+
+def zip_path(src: Path):
+    if src.is_dir():
+        shutil.make_archive(str(src), 'zip', src)
+    else:
+        import zipfile
+        with zipfile.ZipFile(str(src.with_suffix('.zip')), 'w') as zipf:
+            zipf.write(src, arcname=src.name)
+
+async def get_file_info_cached(current_dir: Path, search_query: str = "", show_hidden: bool = False, include_counts: bool = False, sort: str = "name", offset: int = 0, limit: int = 0, metadata: str = "full", file_type: str = "all", dir_stat: os.stat_result = None):
+    # Cache the filtered, ordered entries rather than pages, so scrolling through
+    # a directory scans and sorts it once. DirEntry keeps its stat() result, so
+    # building each page later doesn't stat the entries again.
+    dir_key = str(current_dir)
+    key = (dir_key, search_query, show_hidden, sort, file_type)
+    if dir_stat is None:
+        try:
+            dir_stat = os.stat(current_dir)
+        except Exception:
+            pass
+    mtime_ns = dir_stat.st_mtime_ns if dir_stat else None
+
+    lock_entry = _listing_locks.get(dir_key)
+    if lock_entry is None:
+        lock_entry = _listing_locks[dir_key] = [asyncio.Lock(), 0]
+    lock_entry[1] += 1
+    try:
+        async with lock_entry[0]:
+            cached = _listing_cache.get(key)
+            if cached and cached[1] == mtime_ns and time.monotonic() - cached[0] < LISTING_TTL:
+                _listing_cache.move_to_end(key)
+                entries = cached[2]
+            else:
+                _listing_cache.pop(key, None)
+                entries = await asyncio.to_thread(list_entries, current_dir, search_query, show_hidden, sort, file_type)
+                _listing_cache[key] = (time.monotonic(), mtime_ns, entries)
+                prune_listing_cache()
+    finally:
+        lock_entry[1] -= 1
+        if lock_entry[1] == 0:
+            _listing_locks.pop(dir_key, None)
+
+    return await asyncio.to_thread(build_page, entries, offset, limit, include_counts, metadata, show_hidden)
+
+def prune_listing_cache():
+    # Drop expired entries from the cold end, then trim to the LRU bound
+    now = time.monotonic()
+    while _listing_cache:
+        key, (cached_at, _, _) = next(iter(_listing_cache.items()))
+        if now - cached_at < LISTING_TTL:
+            break
+        del _listing_cache[key]
+    while len(_listing_cache) > LISTING_CACHE_SIZE:
+        _listing_cache.popitem(last=False)
+
+def invalidate_listing(*dirs):
+    targets = set()
+    for d in dirs:
+        try:
+            targets.add(str(Path(d).resolve()))
+        except Exception:
+            continue
+    for key in [k for k in _listing_cache if k[0] in targets]:
+        _listing_cache.pop(key, None)
+
+def resolve_listing_dir(path: str = None) -> Path:
+    if not path or path == "undefined":
+        path = str(HOME_PATH)
+    else:
+        path = unquote(path)
+    return Path(path).resolve()
+
+DISK_USAGE_TTL = 1.0
+_disk_cache: dict[int, tuple[float, dict]] = {}
+_disk_lock = asyncio.Lock()
+
+async def get_disk_info(target_dir: Path, dir_stat: os.stat_result = None):
+    # Every path on the same device reports the same usage, so cache per st_dev
+    device = (dir_stat or os.stat(target_dir)).st_dev
+    async with _disk_lock:
+        cached = _disk_cache.get(device)
+        if cached and time.monotonic() - cached[0] < DISK_USAGE_TTL:
+            return cached[1]
+        # statvfs runs off the loop; requests queued on the lock reuse its result
+        usage = await asyncio.to_thread(shutil.disk_usage, target_dir)
+        disk_info = {
+            "total": f"{usage.total / (1024**3):.1f} GB",
+            "used": f"{usage.used / (1024**3):.1f} GB",
+            "free": f"{usage.free / (1024**3):.1f} GB",
+            "percent": (usage.used / usage.total) * 100
+        }
+        _disk_cache[device] = (time.monotonic(), disk_info)
+        return disk_info
+
+async def _build_listing_payload(target_dir: Path, search: str = "", show_hidden: bool = False, include_counts: bool = False, sort: str = "name", offset: int = 0, limit: int = 0, metadata: str = "full", file_type: str = "all", include_disk: bool = True):
+    offset = max(offset, 0)
+    limit = max(limit, 0)
+    # One stat serves both the listing cache check and the disk-usage device lookup
+    try:
+        dir_stat = os.stat(target_dir)
+    except OSError:
+        dir_stat = None
+    data = await get_file_info_cached(target_dir, search, show_hidden, include_counts, sort, offset, limit, metadata, file_type, dir_stat)
+
+    return {
+        "name": target_dir.name or "Root",
+        "path": str(target_dir),
+        "safe_path": _quote(str(target_dir)),
+        "total": data["total"],
+        "offset": offset,
+        "limit": limit,
+        "next_offset": min(offset + limit, data["total"]) if limit > 0 else data["total"],
+        "folders": data["folders"],
+        "files": data["files"],
+        "breadcrumbs": build_breadcrumbs(target_dir),
+        "disk_info": await get_disk_info(target_dir, dir_stat) if include_disk else None
+    }
 
 @app.get("/login", response_class=HTMLResponse)
 async def login_get(request: Request):
@@ -164,113 +450,87 @@ async def logout(request: Request):
     return RedirectResponse(url="/login")
 
 @app.get("/", response_class=HTMLResponse)
-async def index(request: Request, path: str = None, search: str = "", mode: str = "normal"):
-    device_name = socket.gethostname() or platform.node() or "Local Disk"
-    user_name = getpass.getuser().capitalize()
-    home_path = quote(str(Path.home()))
-    root_path = quote("/")
-
-    if path:
-        path = unquote(path)
-    else:
-        path = str(Path.home())
-    
-    target_dir = Path(path).resolve()
+async def index(request: Request, path: str = None):
+    target_dir = resolve_listing_dir(path)
     
     if target_dir.exists() and not target_dir.is_dir():
-        return RedirectResponse(url=f"/?path={quote(str(target_dir.parent))}")
+        return RedirectResponse(url=f"/?path={_quote(str(target_dir.parent))}")
         
     if not target_dir.exists():
-        return RedirectResponse(url=f"/?path={home_path}")
-
-    # Get disk usage
-    usage = shutil.disk_usage(target_dir)
-    disk_info = {
-        "total": f"{usage.total / (1024**3):.1f} GB",
-        "used": f"{usage.used / (1024**3):.1f} GB",
-        "free": f"{usage.free / (1024**3):.1f} GB",
-        "percent": (usage.used / usage.total) * 100
-    }
-
-    data = get_file_info(target_dir, search)
-    
-    # Build breadcrumbs
-    parts = []
-    curr = target_dir
-    while True:
-        parts.insert(0, {"name": curr.name or "Root", "path": quote(str(curr))})
-        if curr == curr.parent: break
-        curr = curr.parent
+        return RedirectResponse(url=f"/?path={HOME_PATH_QUOTED}")
 
+    # The page is only the shell; the listing itself arrives via /fragment/listing
     return templates.TemplateResponse("index.html", {
         "request": request, 
-        "folders": data["folders"],
-        "files": data["files"],
-        "current_path": str(target_dir),
-        "safe_current_path": quote(str(target_dir)),
-        "current_name": target_dir.name if target_dir.name else "Root",
-        "user_name": user_name,
-        "device_name": device_name,
-        "home_path": home_path,
-        "root_path": root_path,
-        "trash_path": quote(str(TRASH_DIR)),
-        "trash_path_raw": str(TRASH_DIR),
-        "search_query": search,
-        "mode": "normal",
-        "breadcrumbs": parts,
-        "disk_info": disk_info
+        "device_name": DEVICE_NAME,
+        "home_path": HOME_PATH_QUOTED,
+        "trash_path": _quote(str(TRASH_DIR)),
+        "trash_path_raw": str(TRASH_DIR)
     })
 
 @app.get("/api/list")
-async def api_list(path: str = None, search: str = "", show_hidden: bool = False):
-    if not path or path == "undefined":
-        path = str(Path.home())
-    else:
-        path = unquote(path)
-    
-    target_dir = Path(path).resolve()
+async def api_list(path: str = None, search: str = "", show_hidden: bool = False, include_counts: bool = False, sort: str = "name", offset: int = 0, limit: int = 500, metadata: str = "full"):
+    target_dir = resolve_listing_dir(path)
     if not target_dir.exists() or not target_dir.is_dir():
-        target_dir = Path.home()
+        target_dir = HOME_PATH
 
-    data = get_file_info(target_dir, search, show_hidden)
-    
-    # Get disk usage
-    usage = shutil.disk_usage(target_dir)
-    disk_info = {
-        "total": f"{usage.total / (1024**3):.1f} GB",
-        "used": f"{usage.used / (1024**3):.1f} GB",
-        "free": f"{usage.free / (1024**3):.1f} GB",
-        "percent": (usage.used / usage.total) * 100
-    }
+    return await _build_listing_payload(target_dir, search, show_hidden, include_counts, sort, offset, limit, metadata)
 
-    parts = []
-    curr = target_dir
-    while True:
-        parts.insert(0, {"name": curr.name or "Root", "path": str(curr)})
-        if curr == curr.parent: break
-        curr = curr.parent
+@app.get("/api/list/stream")
+async def api_list_stream(path: str = None, search: str = "", show_hidden: bool = False, include_counts: bool = False, sort: str = "name", offset: int = 0, limit: int = 0, metadata: str = "full"):
+    target_dir = resolve_listing_dir(path)
+    if not target_dir.exists() or not target_dir.is_dir():
+        target_dir = HOME_PATH
 
-    return {
-        "name": target_dir.name or "Root",
-        "path": str(target_dir),
-        "safe_path": quote(str(target_dir)),
-        "folders": data["folders"],
-        "files": data["files"],
-        "breadcrumbs": parts,
-        "disk_info": disk_info
-    }
+    return StreamingResponse(
+        generate_ndjson(target_dir, search, show_hidden, include_counts, sort, max(offset, 0), max(limit, 0), metadata),
+        media_type="application/x-ndjson"
+    )
+
+@app.get("/fragment/listing", response_class=HTMLResponse)
+async def listing_fragment(request: Request, path: str = None, search: str = "", show_hidden: bool = False, include_counts: bool = False, view: str = "grid", sort: str = "name", file_type: str = "all", offset: int = 0, limit: int = 500):
+    target_dir = resolve_listing_dir(path)
+    if not target_dir.exists() or not target_dir.is_dir():
+        target_dir = HOME_PATH
+
+    # Unknown values fall back to name order, as in list_entries
+    if sort != "none" and sort not in ENTRY_SORT_KEYS:
+        sort = "name"
+    payload = await _build_listing_payload(target_dir, search, show_hidden, include_counts, sort, offset, limit, file_type=file_type, include_disk=offset <= 0)
+    items = payload["folders"] + payload["files"]
+    if sort in ROW_SORT_KEYS:
+        # Each page is a contiguous slice of the directory-wide order, so sorting it again only merges folders and files
+        items.sort(key=ROW_SORT_KEYS[sort])
+
+    trash_item = None
+    if payload["offset"] == 0 and payload["path"] != str(TRASH_DIR):
+        trash_item = {"special": "trash", "name": "Trash", "rel_path": str(TRASH_DIR), "is_dir": True}
+
+    return templates.TemplateResponse("_listing.html", {
+        "request": request,
+        "items": items,
+        "view": "list" if view == "list" else "grid",
+        "trash_item": trash_item,
+        "meta": {
+            "name": payload["name"],
+            "path": payload["path"],
+            "total": payload["total"],
+            "offset": payload["offset"],
+            "next_offset": payload["next_offset"],
+            "breadcrumbs": payload["breadcrumbs"],
+            "disk_info": payload["disk_info"]
+        }
+    })
 
 @app.post("/copy")
 async def copy_item(path: str = Form(...), item_name: str = Form(...), dest_path: str = Form(...)):
     src = Path(unquote(path)) / item_name
     dest = Path(unquote(dest_path)) / item_name
     try:
-        if src.is_dir():
-            shutil.copytree(src, dest, dirs_exist_ok=True)
-        else:
-            shutil.copy2(src, dest)
+        await asyncio.to_thread(copy_path, src, dest)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    invalidate_listing(dest.parent)
     return {"status": "success"}
 
 @app.post("/move")
@@ -278,24 +538,20 @@ async def move_item(path: str = Form(...), item_name: str = Form(...), dest_path
     src = Path(unquote(path)) / item_name
     dest = Path(unquote(dest_path)) / item_name
     try:
-        shutil.move(str(src), str(dest))
+        await asyncio.to_thread(shutil.move, str(src), str(dest))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    invalidate_listing(src.parent, dest.parent)
     return {"status": "success"}
 
 @app.post("/zip")
 async def zip_item(path: str = Form(...), item_name: str = Form(...)):
     src = Path(unquote(path)) / item_name
-    zip_path = src.with_suffix('.zip')
     try:
-        if src.is_dir():
-            shutil.make_archive(str(src), 'zip', src)
-        else:
-            import zipfile
-            with zipfile.ZipFile(str(zip_path), 'w') as zipf:
-                zipf.write(src, arcname=src.name)
+        await asyncio.to_thread(zip_path, src)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    invalidate_listing(src.parent)
     return {"status": "success"}
 
 @app.post("/unzip")
@@ -303,9 +559,10 @@ async def unzip_item(path: str = Form(...), item_name: str = Form(...)):
     src = Path(unquote(path)) / item_name
     dest = src.parent / src.stem
     try:
-        shutil.unpack_archive(src, dest)
+        await asyncio.to_thread(shutil.unpack_archive, src, dest)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    invalidate_listing(src.parent)
     return {"status": "success"}
 
 @app.get("/preview/{filepath:path}")
@@ -316,10 +573,10 @@ async def preview_file(filepath: str):
     
     mime_type, _ = mimetypes.guess_type(file_path)
     if mime_type and (mime_type.startswith("image/") or mime_type.startswith("text/") or mime_type == "application/pdf"):
-        return FileResponse(file_path)
+        return PagedFileResponse(file_path)
     
     if file_path.suffix in [".py", ".js", ".html", ".css", ".json", ".md", ".sh"]:
-        return FileResponse(file_path, media_type="text/plain")
+        return PagedFileResponse(file_path, media_type="text/plain")
         
     raise HTTPException(status_code=400, detail="Preview not supported for this file type")
 
@@ -330,6 +587,7 @@ async def create_folder(path: str = Form(...), name: str = Form(...)):
         target_dir.mkdir(exist_ok=False)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    invalidate_listing(target_dir.parent)
     return RedirectResponse(url=f"/?path={path}", status_code=303)
 
 @app.post("/create-file")
@@ -339,6 +597,7 @@ async def create_file(path: str = Form(...), name: str = Form(...)):
         target_file.touch(exist_ok=False)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    invalidate_listing(target_file.parent)
     return RedirectResponse(url=f"/?path={path}", status_code=303)
 
 @app.post("/rename")
@@ -350,6 +609,7 @@ async def rename_item(path: str = Form(...), old_name: str = Form(...), new_name
         old_path.rename(new_path)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    invalidate_listing(base)
     return RedirectResponse(url=f"/?path={path}", status_code=303)
 
 @app.post("/upload")
@@ -359,9 +619,11 @@ async def upload_file(path: str, file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="Invalid directory")
         
     file_path = target_dir / file.filename
-    with file_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    return RedirectResponse(url=f"/?path={quote(str(target_dir))}", status_code=303)
+    async with aiofiles.open(file_path, "wb") as out:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await out.write(chunk)
+    invalidate_listing(target_dir)
+    return RedirectResponse(url=f"/?path={_quote(str(target_dir))}", status_code=303)
 
 @app.get("/download/{filepath:path}")
 async def download_file(filepath: str):
@@ -370,41 +632,28 @@ async def download_file(filepath: str):
         raise HTTPException(status_code=404)
     if file_path.is_dir():
         raise HTTPException(status_code=400, detail="Cannot download a directory")
-    return FileResponse(path=file_path, filename=file_path.name)
+    return PagedFileResponse(path=file_path, filename=file_path.name)
 
 @app.post("/api/batch-delete")
 async def batch_delete(path: str = Form(...), item_names: str = Form(...)):
     parent_dir = Path(unquote(path)).resolve()
     names = item_names.split(',')
-    for name in names:
-        target = parent_dir / name
-        if not target.exists() or is_protected_path(target):
-            continue
-        try:
-            if is_in_trash(target):
-                if target.is_dir():
-                    shutil.rmtree(target)
-                else:
-                    target.unlink()
-            else:
-                move_to_trash(target)
-        except Exception:
-            continue
+    await asyncio.gather(
+        *(asyncio.to_thread(delete_or_trash, parent_dir / name) for name in names),
+        return_exceptions=True
+    )
+    invalidate_listing(parent_dir, TRASH_DIR)
     return {"status": "success"}
 
 @app.post("/trash/empty")
 async def empty_trash():
     ensure_trash_dir()
-    for child in list(TRASH_DIR.iterdir()):
-        if is_protected_path(child):
-            continue
-        try:
-            if child.is_dir():
-                shutil.rmtree(child)
-            else:
-                child.unlink()
-        except Exception:
-            continue
+    children = [child for child in TRASH_DIR.iterdir() if not is_protected_path(child)]
+    await asyncio.gather(
+        *(asyncio.to_thread(remove_path, child) for child in children),
+        return_exceptions=True
+    )
+    invalidate_listing(TRASH_DIR)
     return {"status": "success"}
 
 @app.post("/api/batch-copy")
@@ -412,16 +661,11 @@ async def batch_copy(path: str = Form(...), item_names: str = Form(...), dest_pa
     src_dir = Path(unquote(path)).resolve()
     dst_dir = Path(unquote(dest_path)).resolve()
     names = item_names.split(',')
-    for name in names:
-        src = src_dir / name
-        dst = dst_dir / name
-        try:
-            if src.is_dir():
-                shutil.copytree(src, dst, dirs_exist_ok=True)
-            else:
-                shutil.copy2(src, dst)
-        except Exception as e:
-            continue
+    await asyncio.gather(
+        *(asyncio.to_thread(copy_path, src_dir / name, dst_dir / name) for name in names),
+        return_exceptions=True
+    )
+    invalidate_listing(dst_dir)
     return {"status": "success"}
 
 @app.post("/api/batch-move")
@@ -429,13 +673,11 @@ async def batch_move(path: str = Form(...), item_names: str = Form(...), dest_pa
     src_dir = Path(unquote(path)).resolve()
     dst_dir = Path(unquote(dest_path)).resolve()
     names = item_names.split(',')
-    for name in names:
-        src = src_dir / name
-        dst = dst_dir / name
-        try:
-            shutil.move(str(src), str(dst))
-        except Exception as e:
-            continue
+    await asyncio.gather(
+        *(asyncio.to_thread(shutil.move, str(src_dir / name), str(dst_dir / name)) for name in names),
+        return_exceptions=True
+    )
+    invalidate_listing(src_dir, dst_dir)
     return {"status": "success"}
 
 @app.get("/delete/{filepath:path}")
@@ -450,14 +692,21 @@ async def delete_file(filepath: str):
 
     parent_path = str(file_path.parent)
     if is_in_trash(file_path):
-        if file_path.is_dir():
-            shutil.rmtree(file_path)
-        else:
-            file_path.unlink()
+        await asyncio.to_thread(remove_path, file_path)
     else:
-        if not move_to_trash(file_path):
+        if not await asyncio.to_thread(move_to_trash, file_path):
             raise HTTPException(status_code=400, detail="Failed to move item to Trash")
-    return RedirectResponse(url=f"/?path={quote(parent_path)}", status_code=303)
+    invalidate_listing(parent_path, TRASH_DIR)
+    return RedirectResponse(url=f"/?path={_quote(parent_path)}", status_code=303)
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=8080,
+        workers=os.cpu_count(),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+        access_log=False
+    )